@@ -1,6 +1,21 @@
+import base64
+import contextlib
+import functools
+import hashlib
+import http.client
 import http.server
+import io
 import socketserver
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import shlex
+import socket
+import sqlite3
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+import urllib.error
 import urllib.parse
 import urllib.request
 import json
@@ -9,45 +24,123 @@ from mutagen.flac import FLAC
 from mutagen.id3 import ID3
 from mutagen.mp4 import MP4
 
+# orjson is optional: faster parsing of API responses when installed
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 PORT = 8080
-BLACKLIST_FILE = Path(__file__).parent / 'image_blacklist.json'
+BLACKLIST_FILE = Path(__file__).parent / 'image_blacklist.db'
+LEGACY_BLACKLIST_FILE = Path(__file__).parent / 'image_blacklist.json'
+HTML_FILE = Path(__file__).parent / 'mpd-spiffy.html'
+IMAGE_CACHE_DIR = Path(__file__).parent / 'imgcache'
+IMAGE_CACHE_MAX_KEYS = 256  # artist+album combinations kept in memory and on disk
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Image bytes in imgcache/ (or in memory if it isn't writable)
+IMAGE_MAX_BYTES = 20 * 1024 * 1024  # Skip anything bigger than a sane cover/fanart
+CHUNK_SIZE = 64 * 1024
+
+def open_blacklist_db():
+    """Open the blacklist database, importing the old JSON list on first run."""
+    is_new = not BLACKLIST_FILE.exists()
+    # Shared by request threads; writes are serialized by Handler.cache_lock
+    try:
+        db = sqlite3.connect(BLACKLIST_FILE, check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS blacklist (url TEXT PRIMARY KEY)")
+    except sqlite3.Error:
+        # App directory isn't writable; keep the blacklist for this run only
+        db = sqlite3.connect(':memory:', check_same_thread=False)
+        db.execute("CREATE TABLE blacklist (url TEXT PRIMARY KEY)")
+        is_new = True
+    if is_new and LEGACY_BLACKLIST_FILE.exists():
+        try:
+            urls = json_loads(LEGACY_BLACKLIST_FILE.read_bytes())
+            db.executemany("INSERT OR IGNORE INTO blacklist VALUES (?)", [(url,) for url in urls])
+        except:
+            pass
+    db.commit()
+    return db
+
+BLACKLIST_DB = open_blacklist_db()
 
 def load_blacklist():
-    """Load blacklisted image URLs from file."""
+    """Load blacklisted image URLs from the database."""
     try:
-        if BLACKLIST_FILE.exists():
-            with open(BLACKLIST_FILE, 'r') as f:
-                return set(json.load(f))
+        return {row[0] for row in BLACKLIST_DB.execute("SELECT url FROM blacklist")}
     except:
-        pass
-    return set()
+        return set()
 
-def save_blacklist(blacklist):
-    """Save blacklisted image URLs to file."""
+def save_blacklisted_url(img_url):
+    """Add one image URL to the blacklist database."""
     try:
-        with open(BLACKLIST_FILE, 'w') as f:
-            json.dump(list(blacklist), f)
+        BLACKLIST_DB.execute("INSERT OR IGNORE INTO blacklist VALUES (?)", (img_url,))
+        BLACKLIST_DB.commit()
     except:
         pass
 
 IMAGE_BLACKLIST = load_blacklist()
 
 # Whitelist of allowed mpc commands
-ALLOWED_COMMANDS = {
+ALLOWED_COMMANDS = frozenset({
     'status', 'current', 'play', 'pause', 'stop', 'next', 'prev', 'toggle',
     'volume', 'repeat', 'random', 'single', 'consume',
     'playlist', 'add', 'del', 'clear', 'shuffle', 'move',
     'search', 'find', 'findadd', 'searchadd', 'listall',
     'albumart', 'readpicture', 'update', 'stats'
-}
+})
+
+def parse_query(query):
+    """Return (cmd, format, binary, args) from a query string.
+
+    Same results as parse_qs for these keys (blank values are dropped, '+' is a
+    space) without decoding or collecting anything else.
+    """
+    cmd, fmt, binary, args = '', None, False, []
+    for field in query.split('&'):
+        key, _, value = field.partition('=')
+        if not value:
+            continue
+        if '%' in key or '+' in key:
+            key = urllib.parse.unquote_plus(key)
+        if key == 'args':
+            args.append(urllib.parse.unquote_plus(value))
+        elif key == 'cmd':
+            if not cmd:
+                cmd = urllib.parse.unquote_plus(value)
+        elif key == 'format':
+            if fmt is None:
+                fmt = urllib.parse.unquote_plus(value)
+        elif key == 'binary':
+            binary = True
+    return cmd, fmt, binary, args
 
 def get_music_directory():
-    """Get MPD's music directory from mpc config."""
+    """Get MPD's music directory from mpc config, then mpd.conf."""
     try:
-        out = subprocess.check_output(['mpc', 'stats'], text=True, stderr=subprocess.DEVNULL)
-        # Fallback: try common locations or use a safe default
+        # Only answered when mpc reaches MPD over its local socket
+        out = subprocess.check_output(['mpc', 'config'], text=True, stderr=subprocess.DEVNULL).strip()
+        if out and Path(out).is_dir():
+            return Path(out).resolve()
     except:
         pass
+    for conf in [Path.home() / '.config' / 'mpd' / 'mpd.conf', Path.home() / '.mpdconf', Path('/etc/mpd.conf')]:
+        try:
+            for line in conf.read_text().splitlines():
+                try:
+                    # Handles quoting and drops trailing '# comments' like MPD does
+                    parts = shlex.split(line, comments=True)
+                except ValueError:
+                    continue  # Unbalanced quotes
+                if len(parts) == 2 and parts[0] == 'music_directory':
+                    path = Path(parts[1]).expanduser()
+                    if path.is_dir():
+                        return path.resolve()
+        except:
+            pass
     # Common default locations - adjust if needed
     for path in [Path.home() / 'Music', Path('/var/lib/mpd/music')]:
         if path.exists():
@@ -56,41 +149,861 @@ def get_music_directory():
 
 MUSIC_DIR = get_music_directory()
 
+# The UI is a single static page, read once at startup (restart to pick up edits)
+HTML_BYTES = HTML_FILE.read_bytes()
+HTML_ETAG = '"' + hashlib.sha1(HTML_BYTES).hexdigest()[:16] + '"'
+
+# Default song format used by mpc when no -f is given
+MPC_DEFAULT_FORMAT = '[%name%: &[%artist% - ]%title%]|%name%|[%artist% - ]%title%|%file%'
+
+class MPDError(Exception):
+    """MPD answered a command with ACK."""
+
+def mpd_address():
+    """Resolve MPD's address from MPD_HOST/MPD_PORT the same way mpc does."""
+    host = os.environ.get('MPD_HOST')
+    port = int(os.environ.get('MPD_PORT', 6600))
+    password = None
+    if host is None:
+        host = '/run/mpd/socket' if Path('/run/mpd/socket').exists() else 'localhost'
+    elif '@' in host[1:]:
+        password, _, host = host.rpartition('@')
+    return host, port, password
+
+class MPDConnection:
+    """Persistent connection to MPD, used for the UI's polling commands instead of mpc.
+
+    Connects on first use and reconnects once if MPD has dropped the idle
+    connection. Commands are serialized, since MPD answers them in order.
+    """
+
+    def __init__(self, host, port, password=None, timeout=5):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.sock = None
+        self.rfile = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        if self.host.startswith(('/', '@')):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(self.timeout)
+            # A leading @ names an abstract socket
+            self.sock.connect('\0' + self.host[1:] if self.host.startswith('@') else self.host)
+        else:
+            self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.rfile = self.sock.makefile('rb')
+        try:
+            if not self.rfile.readline().startswith(b'OK MPD '):
+                raise ConnectionError("Not an MPD server")
+            if self.password:
+                self.execute('password', self.password)
+            try:
+                # Fetch pictures in fewer round-trips (MPD 0.22.4+)
+                self.execute('binarylimit', str(1024 * 1024))
+            except MPDError:
+                pass
+        except:
+            self.close()
+            raise
+
+    def close(self):
+        if self.sock is not None:
+            self.rfile.close()
+            self.sock.close()
+        self.sock = None
+        self.rfile = None
+
+    def execute(self, command, *args):
+        """Send one command and return its (key, value) pairs; binary payloads are bytes."""
+        if any('\n' in a or '\r' in a for a in args):
+            # A line break would end the command and let the rest run as another one
+            raise ValueError("MPD command arguments can't contain line breaks")
+        line = ' '.join([command] + ['"' + a.replace('\\', '\\\\').replace('"', '\\"') + '"' for a in args])
+        self.sock.sendall(line.encode('utf-8') + b'\n')
+        pairs = []
+        while True:
+            raw = self.rfile.readline()
+            if not raw.endswith(b'\n'):
+                raise ConnectionError("MPD closed the connection")
+            text = raw[:-1].decode('utf-8', 'replace')
+            if text == 'OK':
+                return pairs
+            if text.startswith('ACK '):
+                raise MPDError(text)
+            key, sep, value = text.partition(': ')
+            if not sep:
+                raise ConnectionError(f"Unexpected reply from MPD: {text}")
+            if key == 'binary':
+                pairs.append((key, self.rfile.read(int(value))))
+                self.rfile.readline()
+            else:
+                pairs.append((key, value))
+
+    def commands(self, *commands):
+        """Run several commands back to back, returning the pairs for each."""
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self.connect()
+                    return [self.execute(*command) for command in commands]
+                except MPDError:
+                    raise
+                except OSError:
+                    self.close()
+                    if attempt:
+                        raise
+                except Exception:
+                    # Unknown state; replies left in the buffer would answer later commands
+                    self.close()
+                    raise
+
+MPD_CLIENT = MPDConnection(*mpd_address())
+
+def mpd_song(pairs):
+    """Build a song dict keyed like mpc's format names (first tag value wins)."""
+    song = {}
+    for key, value in pairs:
+        song.setdefault(key.lower(), value)
+    duration = song.pop('time', '')
+    if duration.isdigit() and int(duration) > 0:
+        song['time'] = f"{int(duration) // 60}:{int(duration) % 60:02d}"
+    if 'pos' in song:
+        song['position'] = str(int(song['pos']) + 1)
+    return song
+
+# Names mpc's -f understands; any other %name% is printed as-is
+MPC_FORMAT_TAGS = frozenset({
+    'artist', 'artistsort', 'album', 'albumsort', 'albumartist', 'albumartistsort',
+    'title', 'titlesort', 'track', 'name', 'genre', 'mood', 'date', 'originaldate',
+    'composer', 'composersort', 'performer', 'conductor', 'work', 'ensemble',
+    'movement', 'movementnumber', 'showmovement', 'location', 'grouping',
+    'comment', 'disc', 'label', 'file', 'time', 'position', 'id',
+})
+# mpc renders these itself (local time, its own number formats); leave them to mpc
+MPC_ONLY_FORMAT_TAGS = ('%prio%', '%mtime%', '%mdate%', '%audioformat%')
+FORMAT_ESCAPES = {'a': '\a', 'b': '\b', 't': '\t', 'n': '\n', 'v': '\v', 'f': '\f', 'r': '\r', '[': '[', ']': ']'}
+
+def format_group(fmt, i, song):
+    """Render fmt from index i up to the closing ] of the current group.
+
+    Returns (text, next_index); text is None when the group is closed and
+    no %tag% in it had a value, mirroring mpc's format_object2().
+    """
+    out = []
+    found = False
+    while i < len(fmt):
+        c = fmt[i]
+        if c in '|&':
+            i += 1
+            if c == '|' and not found:
+                out = []  # Left side came up empty, try the alternative
+                continue
+            if c == '&' and found:
+                found = False  # Right side must match too
+                continue
+            # Skip to the next operator or group end at this depth
+            depth = 0
+            while i < len(fmt):
+                if fmt[i] == '#':
+                    i += 1
+                elif fmt[i] == '[':
+                    depth += 1
+                elif depth:
+                    if fmt[i] == ']':
+                        depth -= 1
+                elif fmt[i] in '|&]':
+                    break
+                i += 1
+        elif c == '[':
+            text, i = format_group(fmt, i + 1, song)
+            if text is not None:
+                out.append(text)
+                found = True
+        elif c == ']':
+            return (''.join(out) if found else None), i + 1
+        elif c == '\\':
+            escaped = FORMAT_ESCAPES.get(fmt[i + 1:i + 2])
+            if escaped is None:
+                out.append(c)  # Not an escape: keep the backslash, read on from the next char
+                i += 1
+            else:
+                out.append(escaped)
+                i += 2
+        elif c == '#' and i + 1 < len(fmt):
+            out.append(fmt[i + 1])
+            i += 2
+        elif c == '%':
+            end = i + 1
+            while end < len(fmt) and 'a' <= fmt[end] <= 'z':
+                end += 1
+            if end < len(fmt) and fmt[end] == '%':
+                name = fmt[i + 1:end]
+                if name in MPC_FORMAT_TAGS:
+                    value = song.get(name, '')
+                    if value:
+                        out.append(value)
+                        found = True
+                elif len(name) <= 32:
+                    out.append(fmt[i:end + 1])  # Unknown name, printed as-is and not a match
+                i = end + 1
+            else:
+                out.append(fmt[i:end])
+                i = end
+        else:
+            out.append(c)
+            i += 1
+    # End of the format: mpc keeps whatever was built, even with no match
+    return (''.join(out) if out else None), i
+
+def format_song(song, fmt=None):
+    r"""Format a song like mpc -f: %tag%, [optional groups], | and &, # and backslash escapes.
+
+    >>> song = {'artist': 'Queen', 'title': 'Bicycle Race', 'file': 'q/br.flac', 'time': '3:01'}
+    >>> format_song(song)
+    'Queen - Bicycle Race'
+    >>> format_song({'file': 'x.mp3'})
+    'x.mp3'
+    >>> format_song(song, '[%album% - ]%title%')
+    'Bicycle Race'
+    >>> format_song(song, 'Album: %album%')
+    'Album: '
+    >>> format_song(song, '%artist%\\t%time%\\n\\[%foo%\\]')
+    'Queen\t3:01\n[%foo%]'
+    >>> format_song(song, '[%album%|%artist%] #[ok#] 50\\%')
+    'Queen [ok] 50\\%'
+    >>> format_song(song, '[%artist%&%album%]|[%file%]')
+    'q/br.flac'
+    """
+    return format_group(fmt or MPC_DEFAULT_FORMAT, 0, song)[0] or ''
+
+def format_supported(fmt):
+    """False for formats using fields only mpc itself renders."""
+    return not fmt or not any(name in fmt for name in MPC_ONLY_FORMAT_TAGS)
+
+def mpd_status(fmt, args):
+    """Same text as `mpc status`."""
+    if args or not format_supported(fmt):
+        return None
+    status_pairs, song_pairs = MPD_CLIENT.commands(('status',), ('currentsong',))
+    status = dict(status_pairs)
+    lines = []
+    state = status.get('state')
+    if state in ('play', 'pause'):
+        lines.append(format_song(mpd_song(song_pairs), fmt))
+        elapsed, _, total = status.get('time', '0:0').partition(':')
+        elapsed, total = int(elapsed), int(total or 0)
+        percent = elapsed * 100 // total if total else 0
+        lines.append(f"[{'playing' if state == 'play' else 'paused'}] "
+                     f"#{int(status.get('song', 0)) + 1}/{status.get('playlistlength', 0)} "
+                     f"{elapsed // 60:3d}:{elapsed % 60:02d}/{total // 60}:{total % 60:02d} ({percent}%)")
+    if 'updating_db' in status:
+        lines.append(f"Updating DB (#{status['updating_db']}) ...")
+    volume = int(status.get('volume', -1))
+    flags = {key: 'on ' if status.get(key) == '1' else 'off' for key in ('repeat', 'random', 'single', 'consume')}
+    if status.get('single') == 'oneshot':
+        flags['single'] = 'once'
+    lines.append((f"volume:{volume:3d}%   " if volume >= 0 else "volume: n/a   ") +
+                 f"repeat: {flags['repeat']}   random: {flags['random']}   "
+                 f"single: {flags['single']}   consume: {flags['consume']}")
+    if 'error' in status:
+        lines.append(f"ERROR: {status['error']}")
+    return '\n'.join(lines) + '\n'
+
+def mpd_current(fmt, args):
+    """Same text as `mpc current`: the playing song, or nothing when stopped."""
+    if args or not format_supported(fmt):
+        return None
+    status_pairs, song_pairs = MPD_CLIENT.commands(('status',), ('currentsong',))
+    if dict(status_pairs).get('state') not in ('play', 'pause'):
+        return ''
+    return format_song(mpd_song(song_pairs), fmt) + '\n'
+
+def mpd_playlist(fmt, args):
+    """Same text as `mpc playlist`: one formatted line per queued song."""
+    if args or not format_supported(fmt):
+        return None
+    pairs, = MPD_CLIENT.commands(('playlistinfo',))
+    songs = []
+    for key, value in pairs:
+        if key == 'file':
+            songs.append([])
+        if songs:
+            songs[-1].append((key, value))
+    return ''.join(format_song(mpd_song(song), fmt) + '\n' for song in songs)
+
+def mpd_picture(command, args):
+    """Read embedded or folder art (albumart/readpicture) in binary chunks."""
+    if len(args) != 1:
+        return None
+    data = bytearray()
+    while True:
+        pairs, = MPD_CLIENT.commands((command, args[0], str(len(data))))
+        reply = dict(pairs)
+        chunk = reply.get('binary', b'')
+        data += chunk
+        if not chunk or len(data) >= int(reply.get('size', 0)):
+            return bytes(data)
+
+# Commands answered over MPD_CLIENT; a handler returns None to leave it to mpc
+MPD_COMMANDS = {
+    'status': mpd_status,
+    'current': mpd_current,
+    'playlist': mpd_playlist,
+    'albumart': lambda fmt, args: mpd_picture('albumart', args),
+    'readpicture': lambda fmt, args: mpd_picture('readpicture', args),
+}
+
+# Worker pool for parallel web lookups and image downloads
+FETCH_POOL = ThreadPoolExecutor(max_workers=16)
+
+# Idle keep-alive connections per (scheme, host), reused by later web lookups
+HTTP_POOL_SIZE = 4
+http_idle = {}  # {(scheme, netloc): [HTTPConnection, ...]}
+http_idle_lock = threading.Lock()
+
+# Proxies from http_proxy/https_proxy/no_proxy, as urlopen would use them
+HTTP_PROXIES = urllib.request.getproxies()
+
+@functools.lru_cache(maxsize=256)
+def http_proxy_for(key):
+    """(host, port, extra headers) of the proxy for (scheme, netloc), or None."""
+    scheme, netloc = key
+    proxy = HTTP_PROXIES.get(scheme)
+    if not proxy or urllib.request.proxy_bypass(urllib.parse.urlsplit(f"//{netloc}").hostname or ''):
+        return None
+    parts = urllib.parse.urlsplit(proxy if '://' in proxy else f"http://{proxy}")
+    headers = ()
+    if parts.username:
+        creds = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers = (('Proxy-Authorization', 'Basic ' + base64.b64encode(creds.encode('utf-8')).decode('ascii')),)
+    return parts.hostname, parts.port, headers
+
+def http_request(key, method, target, headers, timeout):
+    """Send a request on an idle pooled connection, or a new one if none is free."""
+    scheme, netloc = key
+    proxy = http_proxy_for(key)
+    if proxy and scheme == 'http':
+        # Plain HTTP goes to the proxy with the full URL as the target
+        target = f"http://{netloc}{target}"
+        headers = {**headers, **dict(proxy[2])}
+    with http_idle_lock:
+        idle = http_idle.get(key)
+        conn = idle.pop() if idle else None
+    if conn is not None:
+        try:
+            conn.sock.settimeout(timeout)
+            conn.request(method, target, headers=headers)
+            return conn, conn.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            # Server dropped the idle connection - retry on a fresh one
+            conn.close()
+        except OSError:
+            # Timeouts aren't retried, so one slow host costs a single timeout
+            conn.close()
+            raise
+    conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+    if proxy is None:
+        conn = conn_class(netloc, timeout=timeout)
+    else:
+        conn = conn_class(proxy[0], proxy[1], timeout=timeout)
+        if scheme == 'https':
+            conn.set_tunnel(netloc, headers=dict(proxy[2]))
+    try:
+        conn.request(method, target, headers=headers)
+        return conn, conn.getresponse()
+    except Exception:
+        conn.close()
+        raise
+
+def http_release(key, conn, resp):
+    """Return a connection to the pool if its response was fully consumed."""
+    if resp.isclosed() and not resp.will_close:
+        with http_idle_lock:
+            idle = http_idle.setdefault(key, [])
+            if len(idle) < HTTP_POOL_SIZE:
+                idle.append(conn)
+                return
+    conn.close()
+
+@contextlib.contextmanager
+def http_open(url, timeout=5, headers=None, method='GET'):
+    """Like urlopen, but keeps connections alive between calls to the same host."""
+    headers = {'User-Agent': 'mpd-web/1.0', **(headers or {})}
+    for _ in range(5):  # Follow a few redirects (image CDNs use them)
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        conn, resp = http_request(key, method, target, headers, timeout)
+        location = resp.getheader('Location')
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            try:
+                resp.read()
+            except Exception:
+                conn.close()
+                raise
+            http_release(key, conn, resp)
+            url = urllib.parse.urljoin(url, location)
+            continue
+        break
+    else:
+        raise urllib.error.URLError(f"Too many redirects: {url}")
+    try:
+        if resp.status >= 400:
+            resp.read()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        yield resp
+    finally:
+        http_release(key, conn, resp)
+
+def fetch_json(url, timeout=5):
+    """Fetch a URL and decode its JSON body."""
+    with http_open(url, timeout=timeout) as resp:
+        return json_loads(resp.read())
+
+# The lookups below take artist/album/term already URL-quoted, since
+# fetch_images quotes each value once and shares it across every source.
+# Each returns a list of image URLs, or None if the source couldn't be queried.
+
+def deezer_album_cover(q_artist, q_album):
+    """Album cover from Deezer album search."""
+    try:
+        data = fetch_json(f"https://api.deezer.com/search/album?q={q_artist}%20{q_album}&limit=1")
+        if data.get('data') and len(data['data']) > 0:
+            cover = data['data'][0].get('cover_xl') or data['data'][0].get('cover_big')
+            if cover:
+                return [cover]
+    except:
+        return None  # Unreachable, as opposed to no match
+    return []
+
+def audiodb_album_images(q_artist, q_album):
+    """Album artwork from TheAudioDB album search."""
+    urls = []
+    try:
+        data = fetch_json(f"https://www.theaudiodb.com/api/v1/json/2/searchalbum.php?s={q_artist}&a={q_album}")
+        if data.get('album') and len(data['album']) > 0:
+            alb = data['album'][0]
+            for key in ['strAlbumThumb', 'strAlbumThumbHQ', 'strAlbumCDart', 'strAlbumSpine']:
+                if alb.get(key):
+                    urls.append(alb[key])
+    except:
+        return None  # Unreachable, as opposed to no match
+    return urls
+
+def deezer_artist_pictures(q_term):
+    """Artist pictures from Deezer artist search, largest first."""
+    urls = []
+    try:
+        data = fetch_json(f"https://api.deezer.com/search/artist?q={q_term}&limit=1")
+        if data.get('data') and len(data['data']) > 0:
+            art = data['data'][0]
+            for key in ['picture_xl', 'picture_big', 'picture_medium']:
+                if art.get(key):
+                    urls.append(art[key])
+    except:
+        return None  # Unreachable, as opposed to no match
+    return urls
+
+def deezer_track_covers(q_artist):
+    """Album covers of the top Deezer track matches."""
+    urls = []
+    try:
+        data = fetch_json(f"https://api.deezer.com/search/track?q={q_artist}&limit=3")
+        for track in data.get('data', []):
+            album_cover = track.get('album', {}).get('cover_xl') or track.get('album', {}).get('cover_big')
+            if album_cover:
+                urls.append(album_cover)
+    except:
+        return None  # Unreachable, as opposed to no match
+    return urls
+
+def audiodb_artist_images(q_artist):
+    """Artist thumbs, fanart and banners from TheAudioDB."""
+    urls = []
+    try:
+        data = fetch_json(f"https://www.theaudiodb.com/api/v1/json/2/search.php?s={q_artist}")
+        if data.get('artists') and len(data['artists']) > 0:
+            art = data['artists'][0]
+            for key in ['strArtistThumb', 'strArtistFanart', 'strArtistFanart2',
+                        'strArtistFanart3', 'strArtistFanart4', 'strArtistCutout',
+                        'strArtistClearart', 'strArtistWideThumb', 'strArtistBanner']:
+                if art.get(key):
+                    urls.append(art[key])
+    except:
+        return None  # Unreachable, as opposed to no match
+    return urls
+
+def probe_image(img_url):
+    """HEAD an image URL; False if it's unreachable, not an image, or too small."""
+    try:
+        with http_open(img_url, timeout=5, headers={'User-Agent': 'Mozilla/5.0'}, method='HEAD') as resp:
+            resp.read()  # Empty for HEAD; lets the connection go back to the pool
+            length = resp.headers.get('Content-Length')
+            content_type = resp.headers.get('Content-Type')
+            if length is not None and length.isdigit() and int(length) <= 500:
+                return False
+            return content_type is None or content_type.startswith('image/')
+    except urllib.error.HTTPError as e:
+        # Some CDNs refuse HEAD but serve GET fine
+        return e.code in (405, 501)
+    except:
+        return False
+
+def download_image(img_url):
+    """Download an image, returning (data, content_type, url) or None."""
+    try:
+        with http_open(img_url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'}) as resp:
+            if int(resp.headers.get('Content-Length') or 0) > IMAGE_MAX_BYTES:
+                return None
+            # Read in large chunks so an oversized body is abandoned early
+            buf = io.BytesIO()
+            for chunk in iter(lambda: resp.read(CHUNK_SIZE), b''):
+                buf.write(chunk)
+                if buf.tell() > IMAGE_MAX_BYTES:
+                    return None
+            content_type = resp.headers.get('Content-Type', 'image/jpeg')
+            if buf.tell() > 500:
+                return (buf.getvalue(), content_type, img_url)
+    except:
+        pass
+    return None
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire after a time-to-live (seconds)."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # {key: (expires_at, value)}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Store a value, optionally with a different lifetime than the default."""
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+# Lyrics responses by (file, artist, title); misses expire sooner so they get retried
+LYRICS_CACHE = TTLCache(maxsize=2048, ttl=24 * 3600)
+NO_LYRICS_TTL = 3600
+LYRICS_FAILED_TTL = 300  # A lookup couldn't reach its API, so retry sooner
+
+def id3_lyrics(path):
+    """First non-empty unsynced lyrics frame of an MP3."""
+    for frame in ID3(path).getall('USLT'):
+        if frame.text:
+            return frame.text
+    return None
+
+def flac_lyrics(path):
+    audio = FLAC(path)
+    return audio.get('LYRICS', audio.get('UNSYNCEDLYRICS', [None]))[0]
+
+def mp4_lyrics(path):
+    return MP4(path).get('\xa9lyr', [None])[0]
+
+# Embedded lyrics reader by lower-case file extension
+LYRICS_EXTRACTORS = {
+    '.mp3': id3_lyrics,
+    '.flac': flac_lyrics,
+    '.m4a': mp4_lyrics,
+    '.mp4': mp4_lyrics,
+}
+
+# Embedded lyrics by (path, mtime_ns), '' when the file has none; an edited
+# file gets a new key, so entries never need to expire
+TAG_LYRICS_CACHE = TTLCache(maxsize=4096, ttl=float('inf'))
+
+# Artwork lookups that came up empty, by cache key -> status to answer with
+ARTWORK_MISS_CACHE = TTLCache(maxsize=4096, ttl=3600)
+DOWNLOAD_FAILED_TTL = 300  # Failed downloads are more likely transient
+
+class ImageCache:
+    """LRU of downloaded images per artist+album, kept as files on disk.
+
+    Each image is stored once as imgcache/<sha1(url)>.img, and each cache key has
+    an index file listing its (url, content_type) pairs, so restarts don't
+    re-download and a single blacklisted image can be dropped on its own.
+    Memory only holds the file paths, so images can be sent with sendfile().
+    Index mtimes track use, and sweep() deletes the least recently used keys
+    past max_keys or once their images exceed max_bytes. If the cache
+    directory isn't writable the image bytes are kept in memory instead,
+    under the same limits. on_evict(cache_key) is called for each key dropped,
+    so callers can forget their own per-key state.
+    """
+
+    def __init__(self, directory, max_keys, max_bytes, on_evict=None):
+        self.directory = directory
+        self.on_evict = on_evict
+        self.max_keys = max_keys
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # {cache_key: [(path or data, content_type, url), ...]}
+        self.size = 0  # Bytes held in memory
+        self.lock = threading.Lock()
+        self.disk_lock = threading.Lock()  # Keeps sweep() from seeing a half-written key
+        self.sweep()
+
+    def path_for(self, name, suffix):
+        return self.directory / (hashlib.sha1(name.encode('utf-8')).hexdigest() + suffix)
+
+    def write_file(self, path, data):
+        """Write via a temp file so readers never see a partial file."""
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def write_index(self, cache_key, images):
+        index = {'key': cache_key, 'images': [[img_url, content_type] for _, content_type, img_url in images]}
+        self.write_file(self.path_for(cache_key, '.json'), json_dumps(index))
+
+    def touch(self, cache_key):
+        """Mark a key's index as recently used, for sweep()."""
+        try:
+            os.utime(self.path_for(cache_key, '.json'))
+        except OSError:
+            pass
+
+    def sweep(self):
+        """Delete the least recently used keys from disk past the limits, and orphaned images."""
+        stale_keys = []
+        with self.disk_lock:
+            try:
+                indexes = []
+                for path in self.directory.glob('*.json'):
+                    try:
+                        indexes.append((path.stat().st_mtime, path))
+                    except OSError:
+                        pass
+                indexes.sort(reverse=True)  # Most recently used first
+                keep = set()
+                size = 0
+                for n, (_, path) in enumerate(indexes):
+                    try:
+                        index = json_loads(path.read_bytes())
+                        blobs = {self.path_for(img_url, '.img') for img_url, _ in index['images']}
+                    except:
+                        index, blobs = {}, set()
+                    for blob in blobs - keep:
+                        try:
+                            size += blob.stat().st_size
+                        except OSError:
+                            pass
+                    # Always keep the newest key, like remember() does
+                    if blobs and (not keep or (n < self.max_keys and size <= self.max_bytes)):
+                        keep |= blobs
+                        continue
+                    if blobs:
+                        size = self.max_bytes + 1  # Keys older than an evicted one go too
+                    stale_keys.append(index.get('key'))
+                    path.unlink(missing_ok=True)
+                for blob in self.directory.glob('*.img'):
+                    if blob not in keep:
+                        blob.unlink(missing_ok=True)
+            except OSError:
+                pass  # Read-only or missing directory; nothing to sweep
+        self.forget(stale_keys)
+
+    def forget(self, cache_keys):
+        """Drop keys from memory and tell on_evict about the ones it held."""
+        dropped = []
+        with self.lock:
+            for cache_key in cache_keys:
+                old = self.entries.pop(cache_key, None)
+                if old is not None:
+                    self.size -= self.memory_size(old)
+                    dropped.append(cache_key)
+        if self.on_evict:
+            for cache_key in dropped:
+                self.on_evict(cache_key)
+
+    def memory_size(self, images):
+        return sum(len(source) for source, _, _ in images if isinstance(source, bytes))
+
+    def remember(self, cache_key, images):
+        """Store in memory, evicting least recently used keys past the limits."""
+        evicted_keys = []
+        with self.lock:
+            old = self.entries.pop(cache_key, None)
+            if old:
+                self.size -= self.memory_size(old)
+            self.entries[cache_key] = images
+            self.size += self.memory_size(images)
+            while len(self.entries) > 1 and (len(self.entries) > self.max_keys or self.size > self.max_bytes):
+                evicted_key, evicted = self.entries.popitem(last=False)
+                self.size -= self.memory_size(evicted)
+                evicted_keys.append(evicted_key)
+        if self.on_evict:
+            for evicted_key in evicted_keys:
+                self.on_evict(evicted_key)
+
+    def get(self, cache_key):
+        """Return cached images for a key from memory, then disk; None on a miss."""
+        with self.lock:
+            images = self.entries.get(cache_key)
+            if images is not None:
+                self.entries.move_to_end(cache_key)
+        if images is not None:
+            self.touch(cache_key)
+            return images
+        images = []
+        try:
+            index = json_loads(self.path_for(cache_key, '.json').read_bytes())
+            for img_url, content_type in index['images']:
+                blob = self.path_for(img_url, '.img')
+                if blob.exists():
+                    images.append((blob, content_type, img_url))
+        except:
+            pass
+        if not images:
+            return None
+        self.touch(cache_key)
+        self.remember(cache_key, images)
+        return images
+
+    def put(self, cache_key, downloads):
+        """Cache downloaded (data, content_type, url) images for a key."""
+        images = []
+        try:
+            self.directory.mkdir(exist_ok=True)
+            with self.disk_lock:
+                for img_data, content_type, img_url in downloads:
+                    blob = self.path_for(img_url, '.img')
+                    self.write_file(blob, img_data)
+                    images.append((blob, content_type, img_url))
+                self.write_index(cache_key, images)
+        except:
+            images = downloads
+        self.remember(cache_key, images)
+        if images is not downloads:
+            self.sweep()
+
+    def remove_url(self, cache_key, img_url):
+        """Drop one image from a key, returning how many images remain.
+
+        The image file is shared by every key listing the URL, so it is
+        dropped from all of them; disk indexes of other keys skip the
+        missing file when loaded, and sweep() tidies them later.
+        """
+        images = [img for img in (self.get(cache_key) or []) if img[2] != img_url]
+        try:
+            self.path_for(img_url, '.img').unlink(missing_ok=True)
+            if images:
+                self.write_index(cache_key, images)
+            else:
+                self.path_for(cache_key, '.json').unlink(missing_ok=True)
+        except:
+            pass
+        emptied = []
+        with self.lock:
+            for other_key, other in self.entries.items():
+                kept = [img for img in other if img[2] != img_url]
+                if len(kept) != len(other):
+                    self.size -= self.memory_size(other) - self.memory_size(kept)
+                    self.entries[other_key] = kept
+                    if not kept:
+                        emptied.append(other_key)
+        if images:
+            self.remember(cache_key, images)
+        else:
+            emptied.append(cache_key)
+        # Keys with nothing left are forgotten and get refetched
+        self.forget(emptied)
+        return len(images)
+
+def forget_image_state(cache_key):
+    """Drop a key's cycle position once ImageCache no longer holds it."""
+    # Single dict operations, so no cache_lock; ImageCache may call this
+    # from a thread that already holds it
+    Handler.image_index.pop(cache_key, None)
+    Handler.current_image_url.pop(cache_key, None)
+
 class Handler(http.server.BaseHTTPRequestHandler):
+    # Keep connections open between the UI's polls; idle ones are dropped after timeout
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+
     def log_message(self, format, *args):
         pass
 
-    def do_GET(self):
-        p = urllib.parse.urlparse(self.path)
-        q = urllib.parse.parse_qs(p.query)
-        cmd = q.get('cmd', [''])[0]
-        fmt = q.get('format', [None])[0]
-        binary = 'binary' in q
-        args = q.get('args', [])
+    def is_not_modified(self, etag):
+        """True when the browser's If-None-Match already names this ETag."""
+        tags = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        return etag in tags or '*' in tags
 
-        # Serve HTML only if no cmd parameter
-        if p.path in ('/', '/mpd-spiffy.html') and not cmd:
+    def send_not_modified(self, etag, headers=None):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def send_file(self, path, content_type, headers=None):
+        """Like send_bytes, but the kernel copies the file straight to the socket.
+
+        Returns False without sending anything if the file can't be opened.
+        """
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return False
+        with f:
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
             self.end_headers()
-            with open('mpd-spiffy.html', 'rb') as f:
-                self.wfile.write(f.read())
-            return
+            self.wfile.flush()
+            self.connection.sendfile(f)
+        return True
 
-        if cmd == 'lyrics':
-            self.handle_lyrics(args)
-            return
+    def send_bytes(self, data, content_type, headers=None):
+        """Send a 200 response with Content-Length so the connection can be reused."""
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        # Slices of a memoryview don't copy, so large images go out in bounded writes
+        view = memoryview(data)
+        for start in range(0, len(view), CHUNK_SIZE):
+            self.wfile.write(view[start:start + CHUNK_SIZE])
 
-        if cmd == 'artistart':
-            self.handle_artistart(args)
-            return
+    def do_GET(self):
+        p = urllib.parse.urlsplit(self.path)
+        cmd, fmt, binary, args = parse_query(p.query)
 
-        if cmd == 'blacklistimg':
-            self.handle_blacklist(args)
+        # Serve HTML only if no cmd parameter
+        if p.path in ('/', '/mpd-spiffy.html') and not cmd:
+            if self.is_not_modified(HTML_ETAG):
+                self.send_not_modified(HTML_ETAG)
+            else:
+                # no-cache: browsers revalidate, so a restarted server's new page is seen
+                self.send_bytes(HTML_BYTES, 'text/html', {'ETag': HTML_ETAG, 'Cache-Control': 'no-cache'})
             return
 
-        if cmd == 'list':
-            self.handle_list(args)
+        # Server-side commands, then whitelisted mpc commands
+        handler = DISPATCH.get(cmd)
+        if handler is not None:
+            handler(self, args)
             return
 
         if not cmd:
@@ -101,6 +1014,24 @@ class Handler(http.server.BaseHTTPRequestHandler):
             self.send_error(403, f"Command not allowed: {cmd}")
             return
 
+        # Hot polling commands go over the persistent MPD connection
+        mpd_command = MPD_COMMANDS.get(cmd)
+        if mpd_command is not None:
+            try:
+                out = mpd_command(fmt, args)
+            except MPDError as e:
+                self.send_error(500, f"mpc error: {e}")
+                return
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            except OSError:
+                out = None  # MPD not reachable directly, let mpc try
+            if out is not None:
+                data = out if isinstance(out, bytes) else out.encode('utf-8')
+                self.send_bytes(data, 'image/jpeg' if binary else 'text/plain; charset=utf-8')
+                return
+
         mpc_args = ['mpc']
         if fmt:
             mpc_args += ['-f', fmt]
@@ -110,16 +1041,10 @@ class Handler(http.server.BaseHTTPRequestHandler):
         try:
             if binary:
                 out = subprocess.check_output(mpc_args, stderr=subprocess.STDOUT)
-                self.send_response(200)
-                self.send_header('Content-type', 'image/jpeg')
-                self.end_headers()
-                self.wfile.write(out)
+                self.send_bytes(out, 'image/jpeg')
             else:
                 out = subprocess.check_output(mpc_args, text=True, stderr=subprocess.STDOUT)
-                self.send_response(200)
-                self.send_header('Content-type', 'text/plain; charset=utf-8')
-                self.end_headers()
-                self.wfile.write(out.encode('utf-8'))
+                self.send_bytes(out.encode('utf-8'), 'text/plain; charset=utf-8')
         except subprocess.CalledProcessError as e:
             self.send_error(500, f"mpc error: {e.output if hasattr(e, 'output') else str(e)}")
         except Exception as e:
@@ -135,6 +1060,12 @@ class Handler(http.server.BaseHTTPRequestHandler):
         title = args[2] if len(args) > 2 else ''
         lyrics = None
 
+        cache_key = (file_path, artist, title)
+        cached = LYRICS_CACHE.get(cache_key)
+        if cached is not None:
+            self.send_bytes(cached, 'text/plain; charset=utf-8')
+            return
+
         # Build full path - MPD returns relative paths from music directory
         full_path = None
         try:
@@ -144,57 +1075,59 @@ class Handler(http.server.BaseHTTPRequestHandler):
                 full_path = (MUSIC_DIR / file_path).resolve()
 
             # Security: ensure path is within music directory
-            if not str(full_path).startswith(str(MUSIC_DIR)):
+            if not full_path.is_relative_to(MUSIC_DIR):
                 full_path = None
         except Exception:
             full_path = None
 
-        # Try embedded lyrics first
-        if full_path and full_path.exists():
+        # Try embedded lyrics first, parsing tags only when the file changed
+        extract = LYRICS_EXTRACTORS.get(os.path.splitext(file_path)[1].lower())
+        try:
+            tag_key = (full_path, full_path.stat().st_mtime_ns) if full_path and extract else None
+        except OSError:
+            tag_key = None
+        if tag_key:
+            lyrics = TAG_LYRICS_CACHE.get(tag_key)
+        if tag_key and lyrics is None:
             try:
-                if file_path.lower().endswith('.mp3'):
-                    audio = ID3(str(full_path))
-                    for frame in audio.getall('USLT'):
-                        if frame.text:
-                            lyrics = frame.text
-                            break
-                elif file_path.lower().endswith('.flac'):
-                    audio = FLAC(str(full_path))
-                    lyrics = audio.get('LYRICS', audio.get('UNSYNCEDLYRICS', [None]))[0]
-                elif file_path.lower().endswith(('.m4a', '.mp4')):
-                    audio = MP4(str(full_path))
-                    lyrics = audio.get('\xa9lyr', [None])[0]
+                lyrics = extract(os.fspath(full_path))
             except Exception:
                 pass
+            TAG_LYRICS_CACHE.set(tag_key, lyrics or '')
 
         # If no embedded lyrics, try web APIs
+        lookup_failed = False
         if not lyrics and artist and title:
+            q_artist = urllib.parse.quote(artist)
+            q_title = urllib.parse.quote(title)
             # Try lrclib.net first (better structured)
             try:
-                url = f"https://lrclib.net/api/get?artist_name={urllib.parse.quote(artist)}&track_name={urllib.parse.quote(title)}"
-                with urllib.request.urlopen(url, timeout=5) as resp:
-                    data = json.loads(resp.read().decode('utf-8'))
-                    lyrics = data.get('plainLyrics') or data.get('syncedLyrics')
+                data = fetch_json(f"https://lrclib.net/api/get?artist_name={q_artist}&track_name={q_title}")
+                lyrics = data.get('plainLyrics') or data.get('syncedLyrics')
+            except urllib.error.HTTPError as e:
+                lookup_failed = e.code != 404  # 404 is how both APIs say "not found"
             except:
-                pass
+                lookup_failed = True
 
             # Fallback to lyrics.ovh
             if not lyrics:
                 try:
-                    url = f"https://api.lyrics.ovh/v1/{urllib.parse.quote(artist)}/{urllib.parse.quote(title)}"
-                    with urllib.request.urlopen(url, timeout=5) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
-                        lyrics = data.get('lyrics')
+                    data = fetch_json(f"https://api.lyrics.ovh/v1/{q_artist}/{q_title}")
+                    lyrics = data.get('lyrics')
+                except urllib.error.HTTPError as e:
+                    lookup_failed = lookup_failed or e.code != 404
                 except:
-                    pass
+                    lookup_failed = True
 
-        if not lyrics:
-            lyrics = "No lyrics found"
+        if lyrics:
+            body = lyrics.encode('utf-8')
+            LYRICS_CACHE.set(cache_key, body)
+        else:
+            body = "No lyrics found".encode('utf-8')
+            # Only keep a miss for long when both APIs actually answered
+            LYRICS_CACHE.set(cache_key, body, ttl=LYRICS_FAILED_TTL if lookup_failed else NO_LYRICS_TTL)
 
-        self.send_response(200)
-        self.send_header('Content-type', 'text/plain; charset=utf-8')
-        self.end_headers()
-        self.wfile.write(lyrics.encode('utf-8'))
+        self.send_bytes(body, 'text/plain; charset=utf-8')
 
     def handle_list(self, args):
         """Proxy for mpc list / find / search commands with formatting"""
@@ -205,19 +1138,105 @@ class Handler(http.server.BaseHTTPRequestHandler):
         rest = args[1:]
         try:
             out = subprocess.check_output(['mpc', 'list', what] + rest, text=True, stderr=subprocess.STDOUT)
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(out.encode('utf-8'))
+            self.send_bytes(out.encode('utf-8'), 'text/plain; charset=utf-8')
         except subprocess.CalledProcessError as e:
             self.send_error(500, f"mpc list error: {e.output if hasattr(e, 'output') else str(e)}")
         except Exception as e:
             self.send_error(500, f"Server error: {str(e)}")
 
     # Class-level cache for images (stores actual image data per artist+album)
-    image_cache = {}  # {cache_key: [(data, content_type, url), ...]}
-    image_index = {}  # {cache_key: current_index}
-    current_image_url = {}  # {cache_key: current_url} - track for blacklisting
+    image_cache = ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_KEYS, IMAGE_CACHE_MAX_BYTES,
+                             on_evict=forget_image_state)
+    image_index = {}  # {cache_key: current_index}, pruned with image_cache
+    current_image_url = {}  # {cache_key: current_url} - track for blacklisting, pruned with image_cache
+    cache_lock = threading.Lock()  # Requests run on their own threads
+    inflight = {}  # {cache_key: Future} - fetches in progress
+
+    def fetch_images(self, artist, album):
+        """Look up and download images for artist+album.
+
+        Returns None when every source answered and none knows the artist,
+        or the list of (data, content_type, url) that downloaded (empty if
+        a lookup or every download failed).
+        """
+        image_urls = []
+        lookup_failed = False
+
+        def urls_from(job):
+            nonlocal lookup_failed
+            urls = job.result()
+            if urls is None:
+                lookup_failed = True
+                return []
+            return urls
+
+        is_soundtrack_search = album and album.lower() in ('soundtrack', 'ost', 'game', 'movie')
+        # URL-quote once for every lookup
+        q_artist = urllib.parse.quote(artist)
+        q_album = urllib.parse.quote(album)
+
+        # For soundtrack/filename searches, try multiple search variations
+        search_terms = [q_artist]
+        if is_soundtrack_search:
+            search_terms.extend([
+                f"{q_artist}%20soundtrack",
+                f"{q_artist}%20ost",
+                f"{q_artist}%20game",
+                f"{q_artist}%20movie"
+            ])
+
+        # Query every source at once; results are merged in priority order below
+        album_jobs = []
+        # If album provided (and not just a soundtrack hint), search for album art first
+        if album and not is_soundtrack_search:
+            album_jobs = [
+                FETCH_POOL.submit(deezer_album_cover, q_artist, q_album),
+                FETCH_POOL.submit(audiodb_album_images, q_artist, q_album),
+            ]
+        artist_jobs = [FETCH_POOL.submit(deezer_artist_pictures, term)
+                       for term in search_terms[:2]]  # Limit API calls
+        # Soundtrack-style content always needs the track search
+        track_job = FETCH_POOL.submit(deezer_track_covers, q_artist) if is_soundtrack_search else None
+        audiodb_job = FETCH_POOL.submit(audiodb_artist_images, q_artist)
+
+        for job in album_jobs:
+            image_urls.extend(urls_from(job))
+
+        # Collect artist images from Deezer (first picture size not already found)
+        for job in artist_jobs:
+            for url in urls_from(job):
+                if url not in image_urls:
+                    image_urls.append(url)
+                    break
+
+        # Otherwise only fall back to track search when nothing was found
+        if track_job is None and not image_urls:
+            track_job = FETCH_POOL.submit(deezer_track_covers, q_artist)
+        if track_job is not None:
+            for url in urls_from(track_job):
+                if url not in image_urls:
+                    image_urls.append(url)
+
+        # Collect artist images from TheAudioDB
+        for url in urls_from(audiodb_job):
+            if url not in image_urls:
+                image_urls.append(url)
+
+        # Filter out blacklisted URLs
+        with Handler.cache_lock:
+            image_urls = [u for u in image_urls if u not in IMAGE_BLACKLIST]
+
+        # No fallback - let the UI show particle nebula instead. A source
+        # that couldn't be reached may know the artist, so that's only a
+        # short-lived miss rather than the hour-long "no such artist".
+        if not image_urls:
+            return [] if lookup_failed else None
+
+        # Cheap parallel HEADs first, so dead hosts and non-images aren't downloaded
+        image_urls = [u for u, ok in zip(image_urls, FETCH_POOL.map(probe_image, image_urls)) if ok]
+
+        # Download all images in parallel (with URL for blacklist tracking)
+        return [img for img in FETCH_POOL.map(download_image, image_urls) if img]
 
     def handle_artistart(self, args):
         """Fetch and proxy images, cycling through cached images per artist+album"""
@@ -230,140 +1249,98 @@ class Handler(http.server.BaseHTTPRequestHandler):
         # Cache key based on artist + album
         cache_key = f"{artist.lower()}|{album.lower()}"
 
-        # Check if we need to fetch images for this combination
-        if cache_key not in Handler.image_cache:
-            image_urls = []
-            is_soundtrack_search = album and album.lower() in ('soundtrack', 'ost', 'game', 'movie')
-
-            # If album provided (and not just a soundtrack hint), search for album art first
-            if album and not is_soundtrack_search:
-                # Try Deezer album search
-                try:
-                    url = f"https://api.deezer.com/search/album?q={urllib.parse.quote(artist + ' ' + album)}&limit=1"
-                    with urllib.request.urlopen(url, timeout=5) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
-                        if data.get('data') and len(data['data']) > 0:
-                            cover = data['data'][0].get('cover_xl') or data['data'][0].get('cover_big')
-                            if cover:
-                                image_urls.append(cover)
-                except:
-                    pass
-
-                # Try TheAudioDB album search
-                try:
-                    url = f"https://www.theaudiodb.com/api/v1/json/2/searchalbum.php?s={urllib.parse.quote(artist)}&a={urllib.parse.quote(album)}"
-                    with urllib.request.urlopen(url, timeout=5) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
-                        if data.get('album') and len(data['album']) > 0:
-                            alb = data['album'][0]
-                            for key in ['strAlbumThumb', 'strAlbumThumbHQ', 'strAlbumCDart', 'strAlbumSpine']:
-                                if alb.get(key):
-                                    image_urls.append(alb[key])
-                except:
-                    pass
-
-            # For soundtrack/filename searches, try multiple search variations
-            search_terms = [artist]
-            if is_soundtrack_search:
-                search_terms.extend([
-                    f"{artist} soundtrack",
-                    f"{artist} ost",
-                    f"{artist} game",
-                    f"{artist} movie"
-                ])
-
-            # Collect artist images from Deezer (try multiple search terms)
-            for term in search_terms[:2]:  # Limit API calls
-                try:
-                    url = f"https://api.deezer.com/search/artist?q={urllib.parse.quote(term)}&limit=1"
-                    with urllib.request.urlopen(url, timeout=5) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
-                        if data.get('data') and len(data['data']) > 0:
-                            art = data['data'][0]
-                            for key in ['picture_xl', 'picture_big', 'picture_medium']:
-                                if art.get(key) and art[key] not in image_urls:
-                                    image_urls.append(art[key])
-                                    break
-                except:
-                    pass
+        # Don't re-run every lookup for artists that recently found nothing
+        miss_status = ARTWORK_MISS_CACHE.get(cache_key)
+        if miss_status == 204:
+            self.send_response(204)  # No Content
+            self.end_headers()
+            return
+        if miss_status == 404:
+            self.send_error(404, "Could not fetch images")
+            return
 
-            # Try Deezer track search for soundtrack-style content
-            if is_soundtrack_search or not image_urls:
+        # Check if we need to fetch images for this combination
+        if Handler.image_cache.get(cache_key) is None:
+            # Only one request per key does the fetch; concurrent ones wait for it
+            with Handler.cache_lock:
+                flight = Handler.inflight.get(cache_key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = Handler.inflight[cache_key] = Future()
+            if is_leader:
                 try:
-                    url = f"https://api.deezer.com/search/track?q={urllib.parse.quote(artist)}&limit=3"
-                    with urllib.request.urlopen(url, timeout=5) as resp:
-                        data = json.loads(resp.read().decode('utf-8'))
-                        for track in data.get('data', []):
-                            album_cover = track.get('album', {}).get('cover_xl') or track.get('album', {}).get('cover_big')
-                            if album_cover and album_cover not in image_urls:
-                                image_urls.append(album_cover)
-                except:
-                    pass
-
-            # Collect artist images from TheAudioDB
-            try:
-                url = f"https://www.theaudiodb.com/api/v1/json/2/search.php?s={urllib.parse.quote(artist)}"
-                with urllib.request.urlopen(url, timeout=5) as resp:
-                    data = json.loads(resp.read().decode('utf-8'))
-                    if data.get('artists') and len(data['artists']) > 0:
-                        art = data['artists'][0]
-                        for key in ['strArtistThumb', 'strArtistFanart', 'strArtistFanart2',
-                                    'strArtistFanart3', 'strArtistFanart4', 'strArtistCutout',
-                                    'strArtistClearart', 'strArtistWideThumb', 'strArtistBanner']:
-                            if art.get(key) and art[key] not in image_urls:
-                                image_urls.append(art[key])
-            except:
-                pass
-
-            # Filter out blacklisted URLs
-            image_urls = [u for u in image_urls if u not in IMAGE_BLACKLIST]
+                    # A previous leader may have finished since the checks above
+                    cached_images = Handler.image_cache.get(cache_key)
+                    miss_status = ARTWORK_MISS_CACHE.get(cache_key)
+                    if miss_status == 404:
+                        cached_images = []
+                    elif cached_images is None and miss_status is None:
+                        cached_images = self.fetch_images(artist, album)
+                        if cached_images:
+                            Handler.image_cache.put(cache_key, cached_images)
+                            with Handler.cache_lock:
+                                Handler.image_index[cache_key] = 0
+                        elif cached_images is None:
+                            ARTWORK_MISS_CACHE.set(cache_key, 204)
+                        else:
+                            ARTWORK_MISS_CACHE.set(cache_key, 404, ttl=DOWNLOAD_FAILED_TTL)
+                    flight.set_result(cached_images)
+                except Exception as e:
+                    flight.set_exception(e)
+                    raise
+                finally:
+                    with Handler.cache_lock:
+                        del Handler.inflight[cache_key]
+            cached_images = flight.result()
 
-            # No fallback - let the UI show particle nebula instead
-            if not image_urls:
+            if cached_images is None:
                 self.send_response(204)  # No Content
                 self.end_headers()
                 return
 
-            # Download and cache all images (with URL for blacklist tracking)
-            cached_images = []
-            for img_url in image_urls:
-                try:
-                    req = urllib.request.Request(img_url, headers={'User-Agent': 'Mozilla/5.0'})
-                    with urllib.request.urlopen(req, timeout=10) as resp:
-                        img_data = resp.read()
-                        content_type = resp.headers.get('Content-Type', 'image/jpeg')
-                        if len(img_data) > 500:
-                            cached_images.append((img_data, content_type, img_url))
-                except:
-                    pass
-
             if not cached_images:
                 self.send_error(404, "Could not fetch images")
                 return
 
-            Handler.image_cache[cache_key] = cached_images
-            Handler.image_index[cache_key] = 0
+        with Handler.cache_lock:
+            # Another request may have blacklisted the last image meanwhile
+            images = Handler.image_cache.get(cache_key)
+            if not images:
+                self.send_response(204)  # No Content
+                self.end_headers()
+                return
 
-        # Get current cached image and cycle to next
-        images = Handler.image_cache[cache_key]
-        idx = Handler.image_index[cache_key]
-        img_data, content_type, img_url = images[idx]
+            # Get current cached image and cycle to next
+            idx = Handler.image_index.get(cache_key, 0) % len(images)
+            source, content_type, img_url = images[idx]
 
-        # Track current image URL for blacklisting
-        Handler.current_image_url[cache_key] = img_url
+            # Track current image URL for blacklisting
+            Handler.current_image_url[cache_key] = img_url
 
-        # Advance index for next request
-        Handler.image_index[cache_key] = (idx + 1) % len(images)
+            # Advance index for next request
+            Handler.image_index[cache_key] = (idx + 1) % len(images)
 
-        # Serve from cache
-        self.send_response(200)
-        self.send_header('Content-type', content_type)
-        self.send_header('X-Image-Index', f"{idx + 1}/{len(images)}")
-        self.send_header('X-Cache', 'HIT')
-        self.send_header('X-Cache-Key', cache_key)
-        self.send_header('Access-Control-Expose-Headers', 'X-Cache-Key, X-Image-Index')
-        self.end_headers()
-        self.wfile.write(img_data)
+        # Serve from cache. The UI cycles by re-requesting the same URL, so the
+        # browser must always revalidate (no-cache) rather than reuse its copy.
+        etag = '"' + hashlib.sha1(img_url.encode('utf-8')).hexdigest()[:16] + '"'
+        headers = {
+            'X-Image-Index': f"{idx + 1}/{len(images)}",
+            'X-Cache': 'HIT',
+            'X-Cache-Key': cache_key,
+            'Access-Control-Expose-Headers': 'X-Cache-Key, X-Image-Index',
+            'Cache-Control': 'no-cache',
+        }
+        if self.is_not_modified(etag):
+            # Browser already holds this image; index has still advanced
+            self.send_not_modified(etag, headers)
+            return
+        headers['ETag'] = etag
+        if isinstance(source, bytes):
+            self.send_bytes(source, content_type, headers)
+        elif not self.send_file(source, content_type, headers):
+            # File went away (blacklisted meanwhile) - show the nebula this time
+            self.send_response(204)  # No Content
+            self.end_headers()
 
     def handle_blacklist(self, args):
         """Blacklist the current image for a given cache key."""
@@ -374,47 +1351,63 @@ class Handler(http.server.BaseHTTPRequestHandler):
 
         cache_key = args[0].lower()
 
-        if cache_key not in Handler.current_image_url:
+        with Handler.cache_lock:
+            img_url = Handler.current_image_url.get(cache_key)
+        if img_url is None:
             self.send_error(404, "No current image for this key")
             return
 
-        img_url = Handler.current_image_url[cache_key]
-
         # Don't blacklist placeholder images
         if 'ui-avatars.com' in img_url:
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            remaining = len(Handler.image_cache.get(cache_key, []))
-            self.wfile.write(json.dumps({'error': 'Cannot blacklist placeholder', 'remaining': remaining}).encode('utf-8'))
+            remaining = len(Handler.image_cache.get(cache_key) or [])
+            self.send_bytes(json_dumps({'error': 'Cannot blacklist placeholder', 'remaining': remaining}), 'application/json')
             return
 
-        # Add to blacklist and save
-        IMAGE_BLACKLIST.add(img_url)
-        save_blacklist(IMAGE_BLACKLIST)
+        with Handler.cache_lock:
+            # Add to blacklist and save
+            IMAGE_BLACKLIST.add(img_url)
+            save_blacklisted_url(img_url)
 
-        # Remove from cache
-        if cache_key in Handler.image_cache:
-            Handler.image_cache[cache_key] = [
-                img for img in Handler.image_cache[cache_key] if img[2] != img_url
-            ]
-            # If cache is now empty, remove it so it gets refetched
-            if not Handler.image_cache[cache_key]:
-                del Handler.image_cache[cache_key]
-                if cache_key in Handler.image_index:
-                    del Handler.image_index[cache_key]
-            else:
-                # Adjust index if needed
-                Handler.image_index[cache_key] = Handler.image_index[cache_key] % len(Handler.image_cache[cache_key])
+            # Remove from cache; if it is now empty it gets refetched next time
+            remaining = Handler.image_cache.remove_url(cache_key, img_url)
+            if remaining:
+                Handler.image_index[cache_key] = Handler.image_index.get(cache_key, 0) % remaining
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        remaining = len(Handler.image_cache.get(cache_key, []))
-        self.wfile.write(json.dumps({'blacklisted': img_url, 'remaining': remaining}).encode('utf-8'))
+        self.send_bytes(json_dumps({'blacklisted': img_url, 'remaining': remaining}), 'application/json')
 
-class ReusableTCPServer(socketserver.TCPServer):
+# Commands handled by the server itself rather than passed to mpc
+DISPATCH = {
+    'lyrics': Handler.handle_lyrics,
+    'artistart': Handler.handle_artistart,
+    'blacklistimg': Handler.handle_blacklist,
+    'list': Handler.handle_list,
+}
+
+class ReusableTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Handle each connection on its own thread so slow web lookups don't stall mpc polls.
+
+    At most max_workers connections are served at once; further ones wait in
+    the listen backlog until a worker finishes.
+    """
     allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 64
+    max_workers = 32
+    worker_slots = threading.BoundedSemaphore(max_workers)
+
+    def process_request(self, request, client_address):
+        self.worker_slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except:
+            self.worker_slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.worker_slots.release()
 
 with ReusableTCPServer(("127.0.0.1", PORT), Handler) as httpd:
     print(f"mpd-web → http://localhost:{PORT}")